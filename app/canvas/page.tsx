@@ -4,7 +4,7 @@ import React, { useRef, useEffect, useState, useCallback } from 'react';
 import { Point, Stroke, Character, Expression } from '@/lib/types';
 import { calculateBoundingBox, generateId } from '@/lib/geometry';
 import { addStrokeToCharacters } from '@/lib/stroke-grouping';
-import { recognizeCharacter, initializeModel, isModelReady, isUsingMLModel, setUseTesseract, isTesseractEnabled, setDebugCanvas } from '@/lib/recognizer';
+import { recognizeCharacters, initializeModel, isModelReady, isUsingMLModel, setUseTesseract, isTesseractEnabled, setDebugCanvas } from '@/lib/recognizer';
 import { buildExpressions, getResultPosition } from '@/lib/expression-parser';
 import { Undo2, Redo2, Trash2, Bug, BugOff, Home, Palette, Keyboard, ScanText, Loader2 } from 'lucide-react';
 import Link from 'next/link';
@@ -25,7 +25,9 @@ export default function CanvasPage() {
   const [canvasSize, setCanvasSize] = useState({ width: 800, height: 600 });
   
   const [isDrawing, setIsDrawing] = useState(false);
-  const [currentStroke, setCurrentStroke] = useState<Point[]>([]);
+  // In-progress stroke points are appended in place; the length state only triggers redraws
+  const currentStrokeRef = useRef<Point[]>([]);
+  const [currentStrokeLength, setCurrentStrokeLength] = useState(0);
   const [strokes, setStrokes] = useState<Stroke[]>([]);
   const [characters, setCharacters] = useState<Character[]>([]);
   const [expressions, setExpressions] = useState<Expression[]>([]);
@@ -131,7 +133,8 @@ export default function CanvasPage() {
     setStrokes([]);
     setCharacters([]);
     setExpressions([]);
-    setCurrentStroke([]);
+    currentStrokeRef.current = [];
+    setCurrentStrokeLength(0);
   }, [strokes, characters]);
 
   // Keyboard shortcuts
@@ -249,14 +252,15 @@ export default function CanvasPage() {
     }
 
     // Draw current stroke
-    if (currentStroke.length > 1) {
+    const currentStroke = currentStrokeRef.current;
+    if (currentStrokeLength > 1) {
       ctx.strokeStyle = '#f59e0b';
       ctx.shadowColor = '#f59e0b';
       ctx.shadowBlur = 12 * dpr;
       
       ctx.beginPath();
       ctx.moveTo(currentStroke[0].x, currentStroke[0].y);
-      for (let i = 1; i < currentStroke.length; i++) {
+      for (let i = 1; i < currentStrokeLength; i++) {
         ctx.lineTo(currentStroke[i].x, currentStroke[i].y);
       }
       ctx.stroke();
@@ -304,7 +308,7 @@ export default function CanvasPage() {
       }
     }
 
-  }, [strokes, currentStroke, characters, expressions, debugMode, strokeColor, canvasSize]);
+  }, [strokes, currentStrokeLength, characters, expressions, debugMode, strokeColor, canvasSize]);
 
   // Process stroke
   const processStroke = useCallback(async (newStroke: Stroke) => {
@@ -329,12 +333,7 @@ export default function CanvasPage() {
           return prev;
         }
 
-        Promise.all(
-          needsRecognition.map(async char => {
-            const result = await recognizeCharacter(char);
-            return { ...char, recognized: result.label, confidence: result.confidence };
-          })
-        ).then(recognizedChars => {
+        recognizeCharacters(needsRecognition).then(recognizedChars => {
           setCharacters(current => {
             const recognized = new Map(recognizedChars.map(c => [c.id, c]));
             const updated = current.map(c => recognized.get(c.id) || c);
@@ -370,20 +369,26 @@ export default function CanvasPage() {
     e.preventDefault();
     setIsDrawing(true);
     const point = getCanvasPoint(e.clientX, e.clientY);
-    setCurrentStroke([point]);
+    currentStrokeRef.current = [point];
+    setCurrentStrokeLength(1);
   }, [getCanvasPoint]);
 
   const handlePointerMove = useCallback((e: React.PointerEvent<HTMLCanvasElement>) => {
     if (!isDrawing) return;
     e.preventDefault();
     const point = getCanvasPoint(e.clientX, e.clientY);
-    setCurrentStroke(prev => [...prev, point]);
+    // Append in place instead of copying the whole stroke on every move
+    currentStrokeRef.current.push(point);
+    setCurrentStrokeLength(currentStrokeRef.current.length);
   }, [isDrawing, getCanvasPoint]);
 
   const handlePointerUp = useCallback(() => {
-    if (!isDrawing || currentStroke.length < 2) {
+    const points = currentStrokeRef.current;
+    currentStrokeRef.current = [];
+    setCurrentStrokeLength(0);
+
+    if (!isDrawing || points.length < 2) {
       setIsDrawing(false);
-      setCurrentStroke([]);
       return;
     }
 
@@ -393,17 +398,16 @@ export default function CanvasPage() {
 
     const newStroke: Stroke = {
       id: generateId(),
-      points: currentStroke,
-      boundingBox: calculateBoundingBox(currentStroke),
+      points,
+      boundingBox: calculateBoundingBox(points),
     };
 
     setStrokes(prev => [...prev, newStroke]);
     setIsDrawing(false);
-    setCurrentStroke([]);
 
     processStroke(newStroke);
     scheduleRecognition();
-  }, [isDrawing, currentStroke, strokes, characters, processStroke, scheduleRecognition]);
+  }, [isDrawing, strokes, characters, processStroke, scheduleRecognition]);
 
   return (
     <div className="h-dvh w-full bg-[#050506] flex flex-col overflow-hidden touch-none">
@@ -18,22 +18,18 @@ export default function Home() {
     return () => window.removeEventListener('resize', checkMobile);
   }, []);
 
-  // Prefetch TensorFlow and model when user hovers over button
+  // Load the recognizer's model when user hovers over button - it is a module
+  // singleton, so the canvas page reuses the already loaded and warmed-up model
   const prefetchModel = useCallback(() => {
     if (prefetchStarted.current) return;
     prefetchStarted.current = true;
     
-    // Dynamically import TensorFlow to start loading it
-    import('@tensorflow/tfjs').then(async (tf) => {
-      try {
-        await tf.setBackend('webgl');
-        await tf.ready();
-        // Prefetch the model file
-        fetch('/model/model.json');
-      } catch {
-        console.log('Prefetch preparation done');
-      }
-    });
+    import('@/lib/recognizer')
+      .then(({ initializeModel }) => initializeModel())
+      .catch((e) => {
+        // Only a prefetch - the canvas page loads the recognizer again itself
+        console.warn('Model prefetch failed:', e);
+      });
   }, []);
 
   const handleNavigate = useCallback(() => {
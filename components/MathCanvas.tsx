@@ -4,7 +4,7 @@ import React, { useRef, useEffect, useState, useCallback } from 'react';
 import { Point, Stroke, Character, Expression } from '@/lib/types';
 import { calculateBoundingBox, generateId } from '@/lib/geometry';
 import { addStrokeToCharacters } from '@/lib/stroke-grouping';
-import { recognizeCharacter, initializeModel, isModelReady, isUsingMLModel } from '@/lib/recognizer';
+import { recognizeCharacters, initializeModel, isModelReady, isUsingMLModel } from '@/lib/recognizer';
 import { buildExpressions, getResultPosition } from '@/lib/expression-parser';
 
 interface MathCanvasProps {
@@ -15,7 +15,9 @@ interface MathCanvasProps {
 export function MathCanvas({ width = 800, height = 600 }: MathCanvasProps) {
   const canvasRef = useRef<HTMLCanvasElement>(null);
   const [isDrawing, setIsDrawing] = useState(false);
-  const [currentStroke, setCurrentStroke] = useState<Point[]>([]);
+  // In-progress stroke points are appended in place; the length state only triggers redraws
+  const currentStrokeRef = useRef<Point[]>([]);
+  const [currentStrokeLength, setCurrentStrokeLength] = useState(0);
   const [strokes, setStrokes] = useState<Stroke[]>([]);
   const [characters, setCharacters] = useState<Character[]>([]);
   const [expressions, setExpressions] = useState<Expression[]>([]);
@@ -82,14 +84,15 @@ export function MathCanvas({ width = 800, height = 600 }: MathCanvasProps) {
     }
 
     // Draw current stroke with active glow
-    if (currentStroke.length > 1) {
+    const currentStroke = currentStrokeRef.current;
+    if (currentStrokeLength > 1) {
       ctx.shadowColor = 'rgba(139, 92, 246, 0.4)';
       ctx.shadowBlur = 10;
       ctx.strokeStyle = '#a78bfa';
       
       ctx.beginPath();
       ctx.moveTo(currentStroke[0].x, currentStroke[0].y);
-      for (let i = 1; i < currentStroke.length; i++) {
+      for (let i = 1; i < currentStrokeLength; i++) {
         ctx.lineTo(currentStroke[i].x, currentStroke[i].y);
       }
       ctx.stroke();
@@ -144,7 +147,7 @@ export function MathCanvas({ width = 800, height = 600 }: MathCanvasProps) {
       }
     }
 
-  }, [strokes, currentStroke, characters, expressions]);
+  }, [strokes, currentStrokeLength, characters, expressions]);
 
   // Process new stroke and trigger recognition
   const processStroke = useCallback(async (newStroke: Stroke) => {
@@ -172,12 +175,7 @@ export function MathCanvas({ width = 800, height = 600 }: MathCanvasProps) {
         if (needsRecognition.length === 0) return prev;
 
         // Process recognition asynchronously
-        Promise.all(
-          needsRecognition.map(async char => {
-            const result = await recognizeCharacter(char);
-            return { ...char, recognized: result.label, confidence: result.confidence };
-          })
-        ).then(recognizedChars => {
+        recognizeCharacters(needsRecognition).then(recognizedChars => {
           setCharacters(current => {
             const recognized = new Map(recognizedChars.map(c => [c.id, c]));
             return current.map(c => recognized.get(c.id) || c);
@@ -233,51 +231,58 @@ export function MathCanvas({ width = 800, height = 600 }: MathCanvasProps) {
   const handlePointerDown = useCallback((e: React.MouseEvent<HTMLCanvasElement>) => {
     setIsDrawing(true);
     const point = getCanvasPoint(e);
-    setCurrentStroke([point]);
+    currentStrokeRef.current = [point];
+    setCurrentStrokeLength(1);
   }, [getCanvasPoint]);
 
   const handlePointerMove = useCallback((e: React.MouseEvent<HTMLCanvasElement>) => {
     if (!isDrawing) return;
     const point = getCanvasPoint(e);
-    setCurrentStroke(prev => [...prev, point]);
+    // Append in place instead of copying the whole stroke on every move
+    currentStrokeRef.current.push(point);
+    setCurrentStrokeLength(currentStrokeRef.current.length);
   }, [isDrawing, getCanvasPoint]);
 
   const handlePointerUp = useCallback(() => {
-    if (!isDrawing || currentStroke.length < 2) {
+    const points = currentStrokeRef.current;
+    currentStrokeRef.current = [];
+    setCurrentStrokeLength(0);
+
+    if (!isDrawing || points.length < 2) {
       setIsDrawing(false);
-      setCurrentStroke([]);
       return;
     }
 
     // Create stroke object
     const newStroke: Stroke = {
       id: generateId(),
-      points: currentStroke,
-      boundingBox: calculateBoundingBox(currentStroke),
+      points,
+      boundingBox: calculateBoundingBox(points),
     };
 
     setStrokes(prev => [...prev, newStroke]);
     setIsDrawing(false);
-    setCurrentStroke([]);
 
     // Process the new stroke
     processStroke(newStroke);
     scheduleRecognition();
-  }, [isDrawing, currentStroke, processStroke, scheduleRecognition]);
+  }, [isDrawing, processStroke, scheduleRecognition]);
 
   // Touch event handlers
   const handleTouchStart = useCallback((e: React.TouchEvent<HTMLCanvasElement>) => {
     e.preventDefault();
     setIsDrawing(true);
     const point = getTouchPoint(e);
-    setCurrentStroke([point]);
+    currentStrokeRef.current = [point];
+    setCurrentStrokeLength(1);
   }, [getTouchPoint]);
 
   const handleTouchMove = useCallback((e: React.TouchEvent<HTMLCanvasElement>) => {
     e.preventDefault();
     if (!isDrawing) return;
     const point = getTouchPoint(e);
-    setCurrentStroke(prev => [...prev, point]);
+    currentStrokeRef.current.push(point);
+    setCurrentStrokeLength(currentStrokeRef.current.length);
   }, [isDrawing, getTouchPoint]);
 
   const handleTouchEnd = useCallback((e: React.TouchEvent<HTMLCanvasElement>) => {
@@ -290,7 +295,8 @@ export function MathCanvas({ width = 800, height = 600 }: MathCanvasProps) {
     setStrokes([]);
     setCharacters([]);
     setExpressions([]);
-    setCurrentStroke([]);
+    currentStrokeRef.current = [];
+    setCurrentStrokeLength(0);
   }, []);
 
   return (
@@ -82,31 +82,38 @@ export function buildExpressionString(characters: Character[]): string {
     .join('');
 }
 
+// Single-pass normalization: each alternative is one rewrite rule
+//   digit x digit -> digit * digit   (x used as multiplication)
+//   ÷ -> /, × -> *
+//   2( -> 2*(, )( -> )*(, )2 -> )*2   (implicit multiplication)
+const NORMALIZE_PATTERN = /(\d)[xX](?=\d)|([÷×])|([\d)])(?=\()|\)(?=\d)/g;
+
+const SYMBOL_REPLACEMENTS: Record<string, string> = {
+  '÷': '/',
+  '×': '*',
+};
+
 /**
  * Normalize expression string for evaluation
  * Handles implicit multiplication and other math conventions
+ * Power notation (2^3) is already supported by math.js
  */
 function normalizeExpression(expr: string): string {
-  let normalized = expr;
-  
-  // Replace 'x' or 'X' with '*' for multiplication (if it looks like multiplication context)
-  normalized = normalized.replace(/(\d)x(\d)/gi, '$1*$2');
-  
-  // Replace '÷' with '/'
-  normalized = normalized.replace(/÷/g, '/');
-  
-  // Replace '×' with '*'
-  normalized = normalized.replace(/×/g, '*');
-  
-  // Handle implicit multiplication: 2(3) -> 2*(3)
-  normalized = normalized.replace(/(\d)\(/g, '$1*(');
-  normalized = normalized.replace(/\)(\d)/g, ')*$1');
-  normalized = normalized.replace(/\)\(/g, ')*(');
-  
-  // Handle power notation: 2^3
-  // Already supported by math.js
-  
-  return normalized;
+  return expr.replace(NORMALIZE_PATTERN, (match, digitBeforeX, symbol, beforeParen) => {
+    if (digitBeforeX !== undefined) return `${digitBeforeX}*`;
+    if (symbol !== undefined) return SYMBOL_REPLACEMENTS[symbol];
+    if (beforeParen !== undefined) return `${beforeParen}*`;
+    return ')*';
+  });
+}
+
+/**
+ * Part of the expression before the first equals sign
+ * Slices once instead of splitting the whole string into parts
+ */
+function beforeEqualsSign(exprString: string): string {
+  const equalsIdx = exprString.indexOf('=');
+  return equalsIdx === -1 ? exprString : exprString.slice(0, equalsIdx);
 }
 
 /**
@@ -114,8 +121,7 @@ function normalizeExpression(expr: string): string {
  */
 export function evaluateExpression(exprString: string): { result: string | null; error: string | null } {
   // Remove equals sign and anything after it
-  const parts = exprString.split('=');
-  const toEvaluate = parts[0].trim();
+  const toEvaluate = beforeEqualsSign(exprString).trim();
   
   if (!toEvaluate || toEvaluate === '?') {
     return { result: null, error: 'Empty expression' };
@@ -211,7 +217,7 @@ export function isExpressionComplete(expression: Expression): boolean {
   if (!expression.hasEquals) return false;
   
   // Must have recognized characters before equals
-  const beforeEquals = expression.text.split('=')[0];
+  const beforeEquals = beforeEqualsSign(expression.text);
   if (!beforeEquals || beforeEquals.includes('?')) return false;
   
   // Must be evaluable
@@ -224,7 +230,7 @@ export function isExpressionComplete(expression: Expression): boolean {
  */
 export function isValidExpression(exprString: string): boolean {
   try {
-    const normalized = normalizeExpression(exprString.split('=')[0]);
+    const normalized = normalizeExpression(beforeEqualsSign(exprString));
     math.parse(normalized);
     return true;
   } catch {
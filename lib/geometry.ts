@@ -99,6 +99,19 @@ export function calculateOverlapRatio(box1: BoundingBox, box2: BoundingBox): { o
   return { overlapX: overlapXRatio, overlapY: overlapYRatio, combined };
 }
 
+// Farthest apart two boxes can be and still be grouped by shouldGroupStrokes:
+// crossing strokes allow a 10px margin, stacked '=' strokes a vertical gap under 30px
+export const STROKE_GROUP_MARGIN = 30;
+
+/**
+ * Cheap bounding-box rejection test run before shouldGroupStrokes
+ * Returns false only if no stroke inside box1 can be grouped with one inside box2
+ */
+export function boxesWithinMargin(box1: BoundingBox, box2: BoundingBox, margin: number = STROKE_GROUP_MARGIN): boolean {
+  return box1.minX - margin <= box2.maxX && box2.minX - margin <= box1.maxX &&
+         box1.minY - margin <= box2.maxY && box2.minY - margin <= box1.maxY;
+}
+
 /**
  * Check if two strokes should be grouped as the same character
  * Must be STRICT to avoid merging separate characters
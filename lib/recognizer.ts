@@ -2,22 +2,60 @@
 // Loads pre-trained model, no training on client
 
 import * as tf from '@tensorflow/tfjs';
+import type Tesseract from 'tesseract.js';
 import { Character, MODEL_LABELS, LETTER_TO_SYMBOL } from './types';
 
 const CANVAS_SIZE = 28;
 
+// WebGL compiles a program per input shape, so batches are padded up to one of
+// a few fixed sizes (larger batches are split) instead of compiling for every N
+const BATCH_SIZES = [1, 4, 8, 16];
+const MAX_BATCH_SIZE = BATCH_SIZES[BATCH_SIZES.length - 1];
+
+// 8-bit quantized weights first (~4x smaller download), then float16 (~2x smaller,
+// near-lossless), with the full float32 model as the final fallback
+const MODEL_URLS = ['/model/uint8/model.json', '/model/float16/model.json', '/model/model.json'];
+
 let model: tf.LayersModel | null = null;
 let isModelLoading = false;
 let modelLoadPromise: Promise<boolean> | null = null;
 let modelLoadFailed = false;
 
-// Tesseract worker (lazy loaded)
-let tesseractWorker: any = null;
-let tesseractLoading = false;
+type Recognition = { label: string; confidence: number };
+
+// In Tesseract mode, ML predictions below this confidence are re-checked with OCR
+const TESSERACT_FALLBACK_CONFIDENCE = 0.85;
+
+// Tesseract worker pool (lazy loaded) - a scheduler spreads jobs across workers
+const MAX_TESSERACT_WORKERS = 4;
+let tesseractScheduler: Tesseract.Scheduler | null = null;
+let tesseractLoadPromise: Promise<Tesseract.Scheduler | null> | null = null;
 let useTesseract = false;
 
+/**
+ * Run one dummy batch of every padded size through the same ops as recognition
+ * so WebGL shaders are compiled and textures allocated before the first real stroke
+ */
+async function warmUpModel(net: tf.LayersModel): Promise<void> {
+  const start = performance.now();
+  try {
+    for (const size of BATCH_SIZES) {
+      const input = tf.zeros([size, CANVAS_SIZE, CANVAS_SIZE, 1]);
+      const prediction = net.predictOnBatch(input) as tf.Tensor;
+      await prediction.data();
+      tf.dispose([input, prediction]);
+    }
+    console.log(`Model warm-up took ${(performance.now() - start).toFixed(0)}ms`);
+  } catch (e) {
+    // Not fatal - the first real prediction just pays the compile cost
+    console.warn('Model warm-up failed:', e);
+  }
+}
+
 /**
  * Initialize the TensorFlow model
+ * The loaded model is a module-level singleton shared by every page, so
+ * calling this early (e.g. from the landing page) makes the canvas start warm
  */
 export async function initializeModel(): Promise<boolean> {
   if (model) return true;
@@ -30,18 +68,30 @@ export async function initializeModel(): Promise<boolean> {
   isModelLoading = true;
   
   modelLoadPromise = (async () => {
+    const start = performance.now();
     try {
       await tf.setBackend('webgl');
       await tf.ready();
       console.log('TensorFlow.js backend:', tf.getBackend());
       
-      console.log('Loading model from /model/model.json...');
-      model = await tf.loadLayersModel('/model/model.json');
-      console.log('✅ Loaded pre-trained model');
-      isModelLoading = false;
-      return true;
+      for (const url of MODEL_URLS) {
+        try {
+          console.log(`Loading model from ${url}...`);
+          const loaded = await tf.loadLayersModel(url);
+          console.log(`✅ Loaded pre-trained model in ${(performance.now() - start).toFixed(0)}ms`);
+          // Publish the model only once it is warm, so isModelReady() and
+          // concurrent callers never see a model that still needs compiling
+          await warmUpModel(loaded);
+          model = loaded;
+          isModelLoading = false;
+          return true;
+        } catch (e) {
+          console.warn(`Model at ${url} unavailable:`, e);
+        }
+      }
+      throw new Error('No model could be loaded');
     } catch (e) {
-      console.error('❌ Model loading failed:', e);
+      console.error(`❌ Model loading failed after ${(performance.now() - start).toFixed(0)}ms:`, e);
       modelLoadFailed = true;
       isModelLoading = false;
       return false;
@@ -52,36 +102,70 @@ export async function initializeModel(): Promise<boolean> {
 }
 
 /**
- * Initialize Tesseract.js worker for OCR fallback
+ * Create a single Tesseract.js worker restricted to math characters
  */
-async function initTesseract(): Promise<boolean> {
-  if (tesseractWorker) return true;
-  if (tesseractLoading) return false;
+async function createTesseractWorker(tesseract: typeof Tesseract): Promise<Tesseract.Worker> {
+  const worker = await tesseract.createWorker('eng', 1, {
+    logger: (m: Tesseract.LoggerMessage) => {
+      if (m.status === 'recognizing text') {
+        console.log(`Tesseract: ${(m.progress * 100).toFixed(0)}%`);
+      }
+    }
+  });
   
-  tesseractLoading = true;
+  await worker.setParameters({
+    tessedit_char_whitelist: '0123456789+-*/=().',
+  });
   
-  try {
-    const Tesseract = await import('tesseract.js');
-    tesseractWorker = await Tesseract.createWorker('eng', 1, {
-      logger: (m: any) => {
-        if (m.status === 'recognizing text') {
-          console.log(`Tesseract: ${(m.progress * 100).toFixed(0)}%`);
-        }
-      }
-    });
-    
-    await tesseractWorker.setParameters({
-      tessedit_char_whitelist: '0123456789+-*/=().',
-    });
-    
-    console.log('✅ Tesseract.js initialized');
-    tesseractLoading = false;
-    return true;
-  } catch (e) {
-    console.error('❌ Tesseract.js not available:', e);
-    tesseractLoading = false;
-    return false;
+  return worker;
+}
+
+/**
+ * Initialize Tesseract.js worker pool for OCR fallback
+ * Resolves to the shared scheduler, or null if Tesseract is unavailable
+ */
+async function initTesseract(): Promise<Tesseract.Scheduler | null> {
+  if (tesseractScheduler) return tesseractScheduler;
+  
+  // Callers arriving while the pool is starting share the same load
+  if (tesseractLoadPromise) {
+    return tesseractLoadPromise;
   }
+  
+  tesseractLoadPromise = (async () => {
+    try {
+      const tesseract = await import('tesseract.js');
+      const poolSize = Math.min(navigator.hardwareConcurrency || 1, MAX_TESSERACT_WORKERS);
+      const settled = await Promise.allSettled(
+        Array.from({ length: poolSize }, () => createTesseractWorker(tesseract))
+      );
+      const workers = settled
+        .filter((r): r is PromiseFulfilledResult<Tesseract.Worker> => r.status === 'fulfilled')
+        .map(r => r.value);
+      
+      // Each worker owns a Web Worker with its own WASM instance and language data,
+      // so shut down the ones that did start before giving up
+      const failed = settled.find((r): r is PromiseRejectedResult => r.status === 'rejected');
+      if (failed) {
+        await Promise.allSettled(workers.map(worker => worker.terminate()));
+        throw failed.reason;
+      }
+      
+      const scheduler = tesseract.createScheduler();
+      workers.forEach(worker => scheduler.addWorker(worker));
+      tesseractScheduler = scheduler;
+      
+      console.log(`✅ Tesseract.js initialized (${poolSize} workers)`);
+      return scheduler;
+    } catch (e) {
+      console.error('❌ Tesseract.js not available:', e);
+      // Allow a later call to retry
+      tesseractLoadPromise = null;
+      return null;
+    }
+  })();
+  
+  return tesseractLoadPromise;
 }
 
 /**
@@ -96,18 +180,30 @@ export function isTesseractEnabled(): boolean {
   return useTesseract;
 }
 
+// Shared raster atlas for model input: characters are stacked vertically in
+// 28x28 cells, so row-major pixels are already in [N, 28, 28] batch order
+let rasterContext: CanvasRenderingContext2D | null = null;
+
+function getRasterContext(cells: number): CanvasRenderingContext2D {
+  if (!rasterContext) {
+    const canvas = document.createElement('canvas');
+    canvas.width = CANVAS_SIZE;
+    canvas.height = CANVAS_SIZE;
+    // Pixels are read back after every draw, so keep the canvas CPU-backed
+    rasterContext = canvas.getContext('2d', { willReadFrequently: true })!;
+  }
+  // Grow only - a larger atlas is reused for smaller batches
+  const canvas = rasterContext.canvas;
+  if (canvas.height < cells * CANVAS_SIZE) {
+    canvas.height = cells * CANVAS_SIZE;
+  }
+  return rasterContext;
+}
+
 /**
- * Convert character strokes to 28x28 image for ML model
+ * Draw character strokes centered in the 28x28 atlas cell starting at `top`
  */
-function characterToImageData(character: Character): Float32Array {
-  const canvas = document.createElement('canvas');
-  canvas.width = CANVAS_SIZE;
-  canvas.height = CANVAS_SIZE;
-  const ctx = canvas.getContext('2d')!;
-
-  ctx.fillStyle = 'black';
-  ctx.fillRect(0, 0, CANVAS_SIZE, CANVAS_SIZE);
-
+function drawCharacterCell(ctx: CanvasRenderingContext2D, character: Character, top: number): void {
   const bbox = character.boundingBox;
   const padding = 3;
   const availableSize = CANVAS_SIZE - padding * 2;
@@ -122,48 +218,85 @@ function characterToImageData(character: Character): Float32Array {
   const scaledHeight = charHeight * finalScale;
 
   const offsetX = padding + (availableSize - scaledWidth) / 2 - bbox.minX * finalScale;
-  const offsetY = padding + (availableSize - scaledHeight) / 2 - bbox.minY * finalScale;
+  const offsetY = top + padding + (availableSize - scaledHeight) / 2 - bbox.minY * finalScale;
 
-  ctx.strokeStyle = 'white';
-  ctx.lineWidth = Math.max(1.5, 2.5 * finalScale);
-  ctx.lineCap = 'round';
-  ctx.lineJoin = 'round';
+  // Keep oversized characters from bleeding into neighbouring cells
+  ctx.save();
+  ctx.beginPath();
+  ctx.rect(0, top, CANVAS_SIZE, CANVAS_SIZE);
+  ctx.clip();
+
+  // Let the canvas apply scale + offset natively instead of per point in JS;
+  // line width is in stroke space, so divide out the scale
+  ctx.setTransform(finalScale, 0, 0, finalScale, offsetX, offsetY);
+  ctx.lineWidth = Math.max(1.5, 2.5 * finalScale) / finalScale;
 
   for (const stroke of character.strokes) {
     if (stroke.points.length < 2) {
       if (stroke.points.length === 1) {
         const p = stroke.points[0];
         ctx.beginPath();
-        ctx.arc(p.x * finalScale + offsetX, p.y * finalScale + offsetY, ctx.lineWidth / 2, 0, Math.PI * 2);
-        ctx.fillStyle = 'white';
+        ctx.arc(p.x, p.y, ctx.lineWidth / 2, 0, Math.PI * 2);
         ctx.fill();
       }
       continue;
     }
 
     ctx.beginPath();
-    ctx.moveTo(stroke.points[0].x * finalScale + offsetX, stroke.points[0].y * finalScale + offsetY);
+    ctx.moveTo(stroke.points[0].x, stroke.points[0].y);
     for (let i = 1; i < stroke.points.length; i++) {
-      ctx.lineTo(stroke.points[i].x * finalScale + offsetX, stroke.points[i].y * finalScale + offsetY);
+      ctx.lineTo(stroke.points[i].x, stroke.points[i].y);
     }
     ctx.stroke();
   }
 
-  const imageData = ctx.getImageData(0, 0, CANVAS_SIZE, CANVAS_SIZE);
-  const data = new Float32Array(CANVAS_SIZE * CANVAS_SIZE);
-  for (let i = 0; i < CANVAS_SIZE * CANVAS_SIZE; i++) {
-    data[i] = imageData.data[i * 4] / 255;
+  ctx.restore();
+}
+
+/**
+ * Smallest fixed batch size that fits `count` characters
+ */
+function paddedBatchSize(count: number): number {
+  return BATCH_SIZES.find(size => size >= count) ?? MAX_BATCH_SIZE;
+}
+
+/**
+ * Render all characters as 28x28 images for the ML model in one atlas,
+ * returning normalized pixels laid out as a [size, 28, 28, 1] batch.
+ * Cells past the last character are left black
+ */
+function charactersToBatch(characters: Character[], size: number): Float32Array {
+  const ctx = getRasterContext(size);
+  const height = size * CANVAS_SIZE;
+
+  ctx.fillStyle = 'black';
+  ctx.fillRect(0, 0, CANVAS_SIZE, height);
+
+  ctx.strokeStyle = 'white';
+  ctx.fillStyle = 'white';
+  ctx.lineCap = 'round';
+  ctx.lineJoin = 'round';
+
+  characters.forEach((char, i) => drawCharacterCell(ctx, char, i * CANVAS_SIZE));
+
+  // Strokes are white on black, so the red channel is already the grayscale value
+  const imageData = ctx.getImageData(0, 0, CANVAS_SIZE, height);
+  const pixels = imageData.data;
+  const batch = new Float32Array(CANVAS_SIZE * height);
+  for (let i = 0; i < batch.length; i++) {
+    batch[i] = pixels[i * 4] / 255;
   }
   
-  // Debug: show what the model sees
+  // Debug: show what the model sees (last character of the batch)
   if (debugCanvas) {
     const debugCtx = debugCanvas.getContext('2d');
     if (debugCtx) {
-      debugCtx.putImageData(imageData, 0, 0);
+      const lastTop = (characters.length - 1) * CANVAS_SIZE;
+      debugCtx.putImageData(imageData, 0, -lastTop, 0, lastTop, CANVAS_SIZE, CANVAS_SIZE);
     }
   }
   
-  return data;
+  return batch;
 }
 
 // Debug canvas to visualize model input
@@ -200,16 +333,17 @@ function characterToOCRCanvas(character: Character): HTMLCanvasElement {
   const offsetY = padding + (availableSize - charHeight * finalScale) / 2 - bbox.minY * finalScale;
 
   ctx.strokeStyle = 'black';
-  ctx.lineWidth = Math.max(2, 3 * finalScale);
+  ctx.setTransform(finalScale, 0, 0, finalScale, offsetX, offsetY);
+  ctx.lineWidth = Math.max(2, 3 * finalScale) / finalScale;
   ctx.lineCap = 'round';
   ctx.lineJoin = 'round';
 
   for (const stroke of character.strokes) {
     if (stroke.points.length < 2) continue;
     ctx.beginPath();
-    ctx.moveTo(stroke.points[0].x * finalScale + offsetX, stroke.points[0].y * finalScale + offsetY);
+    ctx.moveTo(stroke.points[0].x, stroke.points[0].y);
     for (let i = 1; i < stroke.points.length; i++) {
-      ctx.lineTo(stroke.points[i].x * finalScale + offsetX, stroke.points[i].y * finalScale + offsetY);
+      ctx.lineTo(stroke.points[i].x, stroke.points[i].y);
     }
     ctx.stroke();
   }
@@ -221,14 +355,12 @@ function characterToOCRCanvas(character: Character): HTMLCanvasElement {
  * Recognize with Tesseract OCR
  */
 async function recognizeWithTesseract(character: Character): Promise<{ label: string; confidence: number } | null> {
-  if (!tesseractWorker) {
-    const loaded = await initTesseract();
-    if (!loaded) return null;
-  }
+  const scheduler = await initTesseract();
+  if (!scheduler) return null;
   
   try {
     const canvas = characterToOCRCanvas(character);
-    const { data } = await tesseractWorker.recognize(canvas);
+    const { data } = await scheduler.addJob('recognize', canvas);
     
     const text = data.text.trim();
     const confidence = data.confidence / 100;
@@ -245,24 +377,41 @@ async function recognizeWithTesseract(character: Character): Promise<{ label: st
   }
 }
 
+// Stroke directions (first point to last point) and aspect ratio of a character,
+// measured once per recognition pass and passed to all rule-based checks
+interface CharacterShape {
+  aspectRatio: number;
+  strokeDeltas: ({ dx: number; dy: number } | null)[]; // null for strokes with < 2 points
+}
+
+function measureCharacterShape(character: Character): CharacterShape {
+  const bbox = character.boundingBox;
+  return {
+    aspectRatio: bbox.width / Math.max(bbox.height, 1),
+    strokeDeltas: character.strokes.map(stroke => {
+      if (stroke.points.length < 2) return null;
+      const first = stroke.points[0];
+      const last = stroke.points[stroke.points.length - 1];
+      return { dx: last.x - first.x, dy: last.y - first.y };
+    }),
+  };
+}
+
 /**
  * Simple rule-based fallback for operators
  */
-function recognizeWithRules(character: Character): { label: string; confidence: number } {
-  const { strokes, boundingBox: bbox } = character;
-  const numStrokes = strokes.length;
-  const aspectRatio = bbox.width / Math.max(bbox.height, 1);
+function recognizeWithRules(character: Character, shape: CharacterShape): { label: string; confidence: number } {
+  const numStrokes = character.strokes.length;
+  const { aspectRatio, strokeDeltas } = shape;
   
   let hasHorizontal = false;
   let hasVertical = false;
   let hasDiagonal = false;
   
-  for (const stroke of strokes) {
-    if (stroke.points.length < 2) continue;
-    const first = stroke.points[0];
-    const last = stroke.points[stroke.points.length - 1];
-    const dx = Math.abs(last.x - first.x);
-    const dy = Math.abs(last.y - first.y);
+  for (const delta of strokeDeltas) {
+    if (!delta) continue;
+    const dx = Math.abs(delta.dx);
+    const dy = Math.abs(delta.dy);
     
     if (dx > dy * 2) hasHorizontal = true;
     else if (dy > dx * 2) hasVertical = true;
@@ -291,24 +440,18 @@ function recognizeWithRules(character: Character): { label: string; confidence:
 /**
  * Check if '1' is actually '/' (slash)
  */
-function isActuallySlash(character: Character, predictedLabel: string): boolean {
+function isActuallySlash(character: Character, shape: CharacterShape, predictedLabel: string): boolean {
   if (predictedLabel !== '1') return false;
   
-  const { strokes, boundingBox: bbox } = character;
+  const { strokes } = character;
   if (strokes.length !== 1) return false;
+  if (strokes[0].points.length < 3) return false;
   
-  const stroke = strokes[0];
-  if (stroke.points.length < 3) return false;
-  
-  const first = stroke.points[0];
-  const last = stroke.points[stroke.points.length - 1];
-  
-  const dx = last.x - first.x;
-  const dy = last.y - first.y;
+  const { aspectRatio, strokeDeltas } = shape;
+  const { dx, dy } = strokeDeltas[0]!;
   const angle = Math.atan2(dy, dx) * (180 / Math.PI);
   
   const isForwardSlash = (angle > 100 && angle < 170) || (angle > -80 && angle < -10);
-  const aspectRatio = bbox.width / Math.max(bbox.height, 1);
   const hasSlashAspect = aspectRatio > 0.2 && aspectRatio < 0.8;
   const hasDiagonalMovement = Math.abs(dx) > Math.abs(dy) * 0.25;
   
@@ -318,118 +461,215 @@ function isActuallySlash(character: Character, predictedLabel: string): boolean
 /**
  * Check if character is equals sign
  */
-function isEqualsSign(character: Character): boolean {
+function isEqualsSign(character: Character, shape: CharacterShape): boolean {
   const { strokes, boundingBox: bbox } = character;
   if (strokes.length !== 2) return false;
   
-  const aspectRatio = bbox.width / Math.max(bbox.height, 1);
+  const { aspectRatio, strokeDeltas } = shape;
   if (aspectRatio < 1.2) return false;
   
-  for (const stroke of strokes) {
-    if (stroke.points.length < 2) return false;
-    const first = stroke.points[0];
-    const last = stroke.points[stroke.points.length - 1];
-    const dx = Math.abs(last.x - first.x);
-    const dy = Math.abs(last.y - first.y);
-    if (dy > dx * 0.5) return false;
+  for (const delta of strokeDeltas) {
+    if (!delta) return false;
+    if (Math.abs(delta.dy) > Math.abs(delta.dx) * 0.5) return false;
   }
   
-  const stroke1Center = (strokes[0].boundingBox.minY + strokes[0].boundingBox.maxY) / 2;
-  const stroke2Center = (strokes[1].boundingBox.minY + strokes[1].boundingBox.maxY) / 2;
-  const verticalGap = Math.abs(stroke1Center - stroke2Center);
+  const verticalGap = Math.abs(strokes[0].boundingBox.centerY - strokes[1].boundingBox.centerY);
   
   return verticalGap >= 5 && verticalGap <= bbox.height;
 }
 
 /**
- * Main recognition function
+ * Tesseract OCR with the same '1' vs '/' post-processing as the ML path
  */
-export async function recognizeCharacter(character: Character): Promise<{ label: string; confidence: number }> {
-  // Check for equals sign first (model doesn't have it)
-  if (isEqualsSign(character)) {
-    console.log('Rule-based: = (equals sign)');
-    return { label: '=', confidence: 0.85 };
+async function recognizeWithOCR(character: Character, shape: CharacterShape): Promise<Recognition | null> {
+  const ocrResult = await recognizeWithTesseract(character);
+  if (!ocrResult) return null;
+  
+  // Post-process: check if '1' is actually '/'
+  if (isActuallySlash(character, shape, ocrResult.label)) {
+    console.log('Post-process: 1 → /');
+    return { label: '/', confidence: ocrResult.confidence };
   }
+  return ocrResult;
+}
+
+/**
+ * Turn a model prediction into a label, applying post-processing and hybrid OCR
+ */
+async function resolvePrediction(
+  character: Character,
+  shape: CharacterShape,
+  maxIdx: number,
+  maxProb: number,
+  hybridOcr: boolean
+): Promise<Recognition> {
+  let label = MODEL_LABELS[maxIdx] || '?';
   
-  // If Tesseract mode is ON, use ONLY Tesseract (no ML)
-  if (useTesseract) {
+  // Only post-processing: check if '1' is actually '/'
+  if (isActuallySlash(character, shape, label)) {
+    console.log('Post-process: 1 → /');
+    label = '/';
+  }
+  
+  if (LETTER_TO_SYMBOL[label]) {
+    label = LETTER_TO_SYMBOL[label];
+  }
+
+  console.log(`ML: ${label} (${(maxProb * 100).toFixed(1)}%)`);
+
+  // Characters that Tesseract handles better - verify with OCR if confidence is low
+  const tesseractBetterFor = ['7', '2', '9'];
+  if (hybridOcr && tesseractBetterFor.includes(label) && maxProb < 0.8) {
     const ocrResult = await recognizeWithTesseract(character);
-    if (ocrResult) {
-      // Post-process: check if '1' is actually '/'
-      if (isActuallySlash(character, ocrResult.label)) {
-        console.log('Post-process: 1 → /');
-        return { label: '/', confidence: ocrResult.confidence };
-      }
+    if (ocrResult && ocrResult.label !== label) {
+      console.log(`Hybrid: ML said ${label}, Tesseract says ${ocrResult.label} - using Tesseract`);
       return ocrResult;
     }
-    // Fallback to rules if Tesseract fails
-    return recognizeWithRules(character);
   }
-  
-  // Otherwise use ML model
-  const modelAvailable = await initializeModel();
-  
-  if (modelAvailable && model) {
-    try {
-      const imageData = characterToImageData(character);
-      const tensor = tf.tensor4d(imageData, [1, CANVAS_SIZE, CANVAS_SIZE, 1]);
-      
-      const prediction = model.predict(tensor) as tf.Tensor;
-      const probabilities = await prediction.data();
-      
-      tensor.dispose();
-      prediction.dispose();
 
+  return { label, confidence: maxProb };
+}
+
+/**
+ * Run the ML model on all characters, one padded batched predict call per
+ * MAX_BATCH_SIZE characters
+ */
+async function recognizeWithModel(
+  net: tf.LayersModel,
+  characters: Character[],
+  shapes: CharacterShape[],
+  hybridOcr: boolean
+): Promise<Recognition[]> {
+  const labelIndices: number[] = [];
+  const confidences: number[] = [];
+
+  for (let start = 0; start < characters.length; start += MAX_BATCH_SIZE) {
+    const chunk = characters.slice(start, start + MAX_BATCH_SIZE);
+    const size = paddedBatchSize(chunk.length);
+    const batch = charactersToBatch(chunk, size);
+    const tensor = tf.tensor4d(batch, [size, CANVAS_SIZE, CANVAS_SIZE, 1]);
+    // predictOnBatch runs the graph once; predict() would re-validate the input,
+    // split it into 32-sample chunks and concatenate the outputs
+    const prediction = net.predictOnBatch(tensor) as tf.Tensor;
+    // One readback of the whole probability matrix - on WebGL each data() call
+    // is a GPU sync, which costs far more than the few hundred bytes it saves
+    const probabilities = await prediction.data();
+    const numClasses = prediction.shape[1]!;
+    
+    tf.dispose([tensor, prediction]);
+
+    // Outputs for the padding cells are ignored
+    for (let i = 0; i < chunk.length; i++) {
+      const offset = i * numClasses;
       let maxIdx = 0;
-      let maxProb = probabilities[0];
-      for (let i = 1; i < probabilities.length; i++) {
-        if (probabilities[i] > maxProb) {
-          maxProb = probabilities[i];
-          maxIdx = i;
+      let maxProb = probabilities[offset];
+      for (let j = 1; j < numClasses; j++) {
+        if (probabilities[offset + j] > maxProb) {
+          maxProb = probabilities[offset + j];
+          maxIdx = j;
         }
       }
+      labelIndices.push(maxIdx);
+      confidences.push(maxProb);
+    }
+  }
 
-      let label = MODEL_LABELS[maxIdx] || '?';
-      
-      // Only post-processing: check if '1' is actually '/'
-      if (isActuallySlash(character, label)) {
-        console.log('Post-process: 1 → /');
-        label = '/';
-      }
-      
-      if (LETTER_TO_SYMBOL[label]) {
-        label = LETTER_TO_SYMBOL[label];
-      }
+  return Promise.all(
+    characters.map((char, i) => resolvePrediction(char, shapes[i], labelIndices[i], confidences[i], hybridOcr))
+  );
+}
 
-      console.log(`ML: ${label} (${(maxProb * 100).toFixed(1)}%)`);
+/**
+ * Main recognition function - recognizes a batch of characters
+ */
+async function recognizeBatch(characters: Character[]): Promise<Recognition[]> {
+  const results: Recognition[] = new Array(characters.length);
+  const shapes = characters.map(measureCharacterShape);
+  const pending: number[] = [];
+
+  characters.forEach((char, i) => {
+    // Check for equals sign first (model doesn't have it)
+    if (isEqualsSign(char, shapes[i])) {
+      console.log('Rule-based: = (equals sign)');
+      results[i] = { label: '=', confidence: 0.85 };
+    } else {
+      pending.push(i);
+    }
+  });
 
-      // Characters that Tesseract handles better - verify with OCR if confidence is low
-      const tesseractBetterFor = ['7', '2', '9'];
-      if (tesseractBetterFor.includes(label) && maxProb < 0.8) {
-        const ocrResult = await recognizeWithTesseract(character);
-        if (ocrResult && ocrResult.label !== label) {
-          console.log(`Hybrid: ML said ${label}, Tesseract says ${ocrResult.label} - using Tesseract`);
-          return ocrResult;
-        }
+  if (pending.length === 0) return results;
+  
+  const modelAvailable = await initializeModel();
+  
+  if (modelAvailable && model) {
+    try {
+      // In Tesseract mode the per-label hybrid check is replaced by the
+      // confidence-based fallback below, so don't OCR anything twice
+      const predictions = await recognizeWithModel(
+        model,
+        pending.map(i => characters[i]),
+        pending.map(i => shapes[i]),
+        !useTesseract
+      );
+      pending.forEach((idx, j) => { results[idx] = predictions[j]; });
+      
+      // If Tesseract mode is ON, only low-confidence characters go to OCR
+      if (useTesseract) {
+        const lowConfidence = pending.filter(i => results[i].confidence < TESSERACT_FALLBACK_CONFIDENCE);
+        await Promise.all(
+          lowConfidence.map(async i => {
+            const ocrResult = await recognizeWithOCR(characters[i], shapes[i]);
+            if (!ocrResult) return;
+            const mlResult = results[i];
+            if (ocrResult.label === mlResult.label) {
+              // Agreement backs up the ML label
+              results[i] = { label: mlResult.label, confidence: Math.max(mlResult.confidence, ocrResult.confidence) };
+            } else if (ocrResult.confidence > mlResult.confidence) {
+              console.log(`Fallback: ML said ${mlResult.label}, Tesseract says ${ocrResult.label} - using Tesseract`);
+              results[i] = ocrResult;
+            } else {
+              console.log(`Fallback: ML said ${mlResult.label}, Tesseract says ${ocrResult.label} - keeping ML`);
+            }
+          })
+        );
       }
-
-      return { label, confidence: maxProb };
+      return results;
     } catch (e) {
       console.error('ML failed:', e);
     }
   }
   
+  // Without the model, Tesseract mode runs OCR on every character
+  if (useTesseract) {
+    await Promise.all(
+      pending.map(async i => {
+        // Fallback to rules if Tesseract fails
+        results[i] = (await recognizeWithOCR(characters[i], shapes[i])) ?? recognizeWithRules(characters[i], shapes[i]);
+      })
+    );
+    return results;
+  }
+  
   // Final fallback
-  return recognizeWithRules(character);
+  for (const i of pending) {
+    results[i] = recognizeWithRules(characters[i], shapes[i]);
+  }
+  return results;
+}
+
+export async function recognizeCharacter(character: Character): Promise<Recognition> {
+  const [result] = await recognizeBatch([character]);
+  return result;
 }
 
 export async function recognizeCharacters(characters: Character[]): Promise<Character[]> {
-  return Promise.all(
-    characters.map(async (char) => {
-      const result = await recognizeCharacter(char);
-      return { ...char, recognized: result.label, confidence: result.confidence };
-    })
-  );
+  if (characters.length === 0) return [];
+  const results = await recognizeBatch(characters);
+  return characters.map((char, i) => ({
+    ...char,
+    recognized: results[i].label,
+    confidence: results[i].confidence,
+  }));
 }
 
 export function isModelReady(): boolean {
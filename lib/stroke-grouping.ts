@@ -3,6 +3,7 @@
 import { Stroke, Character, BoundingBox } from './types';
 import { 
   shouldGroupStrokes, 
+  boxesWithinMargin,
   mergeBoundingBoxes, 
   generateId 
 } from './geometry';
@@ -35,6 +36,7 @@ export function groupStrokesIntoCharacters(strokes: Stroke[]): Character[] {
   // Compare all stroke pairs and group overlapping ones
   for (let i = 0; i < strokes.length; i++) {
     for (let j = i + 1; j < strokes.length; j++) {
+      if (!boxesWithinMargin(strokes[i].boundingBox, strokes[j].boundingBox)) continue;
       if (shouldGroupStrokes(strokes[i], strokes[j])) {
         union(i, j);
       }
@@ -82,6 +84,8 @@ export function addStrokeToCharacters(
   
   for (let i = 0; i < existingCharacters.length; i++) {
     const char = existingCharacters[i];
+    // Far from the whole character means far from every one of its strokes
+    if (!boxesWithinMargin(char.boundingBox, newStroke.boundingBox)) continue;
     // Check if new stroke should be grouped with any stroke in this character
     for (const existingStroke of char.strokes) {
       if (shouldGroupStrokes(existingStroke, newStroke)) {
@@ -111,7 +115,8 @@ export function addStrokeToCharacters(
     const updated = [...existingCharacters];
     const char = updated[idx];
     const newStrokes = [...char.strokes, newStroke];
-    const newBoundingBox = mergeBoundingBoxes(newStrokes.map(s => s.boundingBox));
+    // The character's box already covers its strokes - only fold in the new one
+    const newBoundingBox = mergeBoundingBoxes([char.boundingBox, newStroke.boundingBox]);
     
     updated[idx] = {
       ...char,
@@ -125,18 +130,22 @@ export function addStrokeToCharacters(
   }
 
   // Multiple overlaps - merge characters
+  const overlapping = new Set(overlappingIndices);
   const mergedStrokes: Stroke[] = [newStroke];
+  const mergedBoxes: BoundingBox[] = [newStroke.boundingBox];
   const remainingCharacters: Character[] = [];
   
   for (let i = 0; i < existingCharacters.length; i++) {
-    if (overlappingIndices.includes(i)) {
+    if (overlapping.has(i)) {
       mergedStrokes.push(...existingCharacters[i].strokes);
+      mergedBoxes.push(existingCharacters[i].boundingBox);
     } else {
       remainingCharacters.push(existingCharacters[i]);
     }
   }
 
-  const mergedBoundingBox = mergeBoundingBoxes(mergedStrokes.map(s => s.boundingBox));
+  // Merge per-character boxes rather than every stroke's box
+  const mergedBoundingBox = mergeBoundingBoxes(mergedBoxes);
   
   return [
     ...remainingCharacters,
@@ -1,7 +1,23 @@
 import type { NextConfig } from "next";
 
 const nextConfig: NextConfig = {
-  /* config options here */
+  async headers() {
+    return [
+      {
+        // Quantized weight shards are named after a hash of their contents
+        // (scripts/quantize-model.mjs), so a given URL never changes and can be
+        // cached for good. model.json keeps Next's default revalidation and
+        // points at the new shard names after a retrain
+        source: "/model/:dtype(uint8|float16)/:shard([\\w-]+\\.[0-9a-f]{16}\\.bin)",
+        headers: [
+          {
+            key: "Cache-Control",
+            value: "public, max-age=31536000, immutable",
+          },
+        ],
+      },
+    ];
+  },
 };
 
 export default nextConfig;
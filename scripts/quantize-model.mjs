@@ -0,0 +1,198 @@
+// Post-training weight quantization for the TensorFlow.js layers model
+// Reads public/model (float32) and writes reduced-precision copies to
+// public/model/uint8 and public/model/float16
+//
+// Each copy records a hash of the float32 files it was made from, and copies
+// that are already up to date are skipped, so this runs before every dev/build.
+// Shards are named after a hash of their contents so they can be cached forever
+//
+// Usage: node scripts/quantize-model.mjs [uint8] [float16]
+
+import { createHash } from 'crypto';
+import { existsSync, readFileSync, readdirSync, writeFileSync, mkdirSync, unlinkSync } from 'fs';
+import { dirname, join } from 'path';
+import { fileURLToPath } from 'url';
+
+const ROOT = join(dirname(fileURLToPath(import.meta.url)), '..');
+const SRC_DIR = join(ROOT, 'public', 'model');
+const LEVELS = 255;
+
+/**
+ * Affine-quantize a float32 tensor to uint8 the same way tensorflowjs_converter
+ * does: the range is nudged so that 0.0 maps exactly onto an integer step.
+ */
+function quantizeUint8(values) {
+  let min = 0;
+  let max = 0;
+  for (const v of values) {
+    if (v < min) min = v;
+    if (v > max) max = v;
+  }
+
+  let scale = (max - min) / LEVELS;
+  if (scale === 0) scale = 1;
+  const zeroPoint = Math.round(-min / scale);
+  const nudgedMin = -zeroPoint * scale;
+
+  const quantized = new Uint8Array(values.length);
+  for (let i = 0; i < values.length; i++) {
+    const q = Math.round((values[i] - nudgedMin) / scale);
+    quantized[i] = Math.min(Math.max(q, 0), LEVELS);
+  }
+
+  return { bytes: quantized, quantization: { dtype: 'uint8', min: nudgedMin, scale } };
+}
+
+const f32 = new Float32Array(1);
+const u32 = new Uint32Array(f32.buffer);
+
+/**
+ * Convert a float32 value to IEEE 754 half-precision bits (round to nearest even)
+ */
+function toFloat16Bits(value) {
+  f32[0] = value;
+  const bits = u32[0];
+  const sign = (bits >>> 16) & 0x8000;
+  const mantissa = bits & 0x7fffff;
+  let exponent = ((bits >>> 23) & 0xff) - 127 + 15;
+
+  if (exponent === 128 + 15) return sign | 0x7c00 | (mantissa ? 0x200 : 0);
+  if (exponent >= 0x1f) return sign | 0x7c00;
+
+  if (exponent <= 0) {
+    // Subnormal half (or underflow to signed zero)
+    if (exponent < -10) return sign;
+    const full = mantissa | 0x800000;
+    const shift = 14 - exponent;
+    const rest = full & ((1 << shift) - 1);
+    const halfway = 1 << (shift - 1);
+    let half = full >> shift;
+    if (rest > halfway || (rest === halfway && (half & 1))) half++;
+    return sign | half;
+  }
+
+  // A carry out of the mantissa correctly bumps the exponent
+  let half = (exponent << 10) | (mantissa >> 13);
+  const rest = mantissa & 0x1fff;
+  if (rest > 0x1000 || (rest === 0x1000 && (half & 1))) half++;
+  return sign | half;
+}
+
+function quantizeFloat16(values) {
+  const quantized = new Uint16Array(values.length);
+  for (let i = 0; i < values.length; i++) {
+    quantized[i] = toFloat16Bits(values[i]);
+  }
+  return { bytes: new Uint8Array(quantized.buffer), quantization: { dtype: 'float16' } };
+}
+
+const QUANTIZERS = {
+  uint8: quantizeUint8,
+  float16: quantizeFloat16,
+};
+
+/**
+ * Hash the float32 model.json and every weight shard it references
+ */
+function hashSourceModel(modelJson, model) {
+  const hash = createHash('sha256').update(modelJson);
+  for (const group of model.weightsManifest) {
+    for (const p of group.paths) {
+      hash.update(readFileSync(join(SRC_DIR, p)));
+    }
+  }
+  return hash.digest('hex');
+}
+
+function isUpToDate(outDir, sourceHash) {
+  const manifestPath = join(outDir, 'model.json');
+  if (!existsSync(manifestPath)) return false;
+  const quantized = JSON.parse(readFileSync(manifestPath, 'utf8'));
+  return (
+    quantized.userDefinedMetadata?.quantizedFrom === sourceHash &&
+    quantized.weightsManifest.every(group => group.paths.every(p => existsSync(join(outDir, p))))
+  );
+}
+
+/**
+ * Shard file name with a content hash, e.g. group1-shard1of1.0123456789abcdef.bin
+ */
+function hashedShardName(name, bytes) {
+  const hash = createHash('sha256').update(bytes).digest('hex').slice(0, 16);
+  return name.replace(/\.bin$/, `.${hash}.bin`);
+}
+
+function writeQuantizedModel(model, dtype, sourceHash) {
+  const quantize = QUANTIZERS[dtype];
+  if (!quantize) throw new Error(`Unknown dtype ${dtype}`);
+
+  const outDir = join(SRC_DIR, dtype);
+  if (isUpToDate(outDir, sourceHash)) {
+    console.log(`${dtype} model in ${outDir} is up to date`);
+    return;
+  }
+  mkdirSync(outDir, { recursive: true });
+  const outManifest = [];
+
+  for (const group of model.weightsManifest) {
+    const shards = group.paths.map(p => readFileSync(join(SRC_DIR, p)));
+    const buffer = Buffer.concat(shards);
+    let offset = 0;
+
+    const chunks = [];
+    const weights = [];
+    for (const weight of group.weights) {
+      const size = weight.shape.reduce((a, b) => a * b, 1);
+      if (weight.dtype !== 'float32' || weight.quantization) {
+        throw new Error(`Unsupported weight ${weight.name} (${weight.dtype})`);
+      }
+
+      const values = new Float32Array(buffer.buffer.slice(buffer.byteOffset + offset, buffer.byteOffset + offset + size * 4));
+      offset += size * 4;
+
+      const { bytes, quantization } = quantize(values);
+      chunks.push(bytes);
+      weights.push({ ...weight, quantization });
+    }
+
+    // Quantized weights are 2-4x smaller, so each group fits in a single shard
+    const shard = Buffer.concat(chunks);
+    const shardName = hashedShardName(group.paths[0], shard);
+    writeFileSync(join(outDir, shardName), shard);
+    outManifest.push({ paths: [shardName], weights });
+  }
+
+  // Drop shards from earlier runs that the new manifest no longer references
+  const current = new Set(outManifest.flatMap(group => group.paths));
+  for (const file of readdirSync(outDir)) {
+    if (file.endsWith('.bin') && !current.has(file)) unlinkSync(join(outDir, file));
+  }
+
+  // Compact JSON: smaller download and less for the browser to parse
+  writeFileSync(
+    join(outDir, 'model.json'),
+    JSON.stringify({
+      ...model,
+      weightsManifest: outManifest,
+      userDefinedMetadata: { ...model.userDefinedMetadata, quantizedFrom: sourceHash },
+    })
+  );
+
+  console.log(`Wrote ${dtype} model to ${outDir}`);
+}
+
+const srcManifest = join(SRC_DIR, 'model.json');
+if (!existsSync(srcManifest)) {
+  // Nothing trained yet - don't fail the dev/build hooks
+  console.log(`No model at ${srcManifest}, skipping quantization`);
+  process.exit(0);
+}
+
+const modelJson = readFileSync(srcManifest);
+const model = JSON.parse(modelJson.toString('utf8'));
+const sourceHash = hashSourceModel(modelJson, model);
+const dtypes = process.argv.length > 2 ? process.argv.slice(2) : Object.keys(QUANTIZERS);
+
+for (const dtype of dtypes) {
+  writeQuantizedModel(model, dtype, sourceHash);
+}